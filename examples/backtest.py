@@ -8,6 +8,7 @@ import argparse
 from pathlib import Path
 import json
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 import numpy as np
 from datetime import datetime
 import logging
@@ -30,12 +31,19 @@ class Backtester:
         df_signals = signals.copy()
         if 'ts' not in df_signals.columns:
             raise ValueError("Signals DataFrame must contain 'ts' column")
-        df_signals = df_signals.set_index(pd.to_datetime(df_signals['ts']))
+        ts = df_signals['ts']
+        # Parquet inputs already carry datetime64 columns; only parse strings/ints
+        if not is_datetime64_any_dtype(ts):
+            ts = pd.to_datetime(ts)
+        df_signals = df_signals.set_index(ts)
         df_signals.index.name = 'timestamp'
         ohlcv_indexed = ohlcv.copy()
         if not isinstance(ohlcv_indexed.index, pd.DatetimeIndex):
             if 'timestamp' in ohlcv_indexed.columns:
-                ohlcv_indexed = ohlcv_indexed.set_index(pd.to_datetime(ohlcv_indexed['timestamp']), drop=True)
+                ts = ohlcv_indexed['timestamp']
+                if not is_datetime64_any_dtype(ts):
+                    ts = pd.to_datetime(ts)
+                ohlcv_indexed = ohlcv_indexed.set_index(ts, drop=True)
         ohlcv_indexed = ohlcv_indexed.sort_index()
         # Align signals to OHLCV timestamps (forward fill latest signal)
         merged = ohlcv_indexed.merge(df_signals[['signal','position_size']], how='left', left_index=True, right_index=True)
@@ -60,8 +60,9 @@ def compute_technical_features(df: pd.DataFrame) -> pd.DataFrame:
 
 def align_and_fill(df: pd.DataFrame) -> pd.DataFrame:
     """Align index and forward fill/backfill missing values."""
-    # Ensure timestamp index
-    df.index = pd.to_datetime(df.index)
+    # Ensure timestamp index (skip the conversion when it is already datetime)
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index)
 
     # Sort by time
     df = df.sort_index()
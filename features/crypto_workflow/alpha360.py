@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, Union, List
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Union, List
 from enum import Enum
 
 class FeatureGroup(Enum):
@@ -12,45 +13,45 @@ class FeatureGroup(Enum):
 
 class Alpha360Calculator:
     """Calculates Alpha360 features grouped by type."""
+
+    # Feature functions by group, built once per class. Each entry takes the
+    # calculator and the OHLCV frame; it looks the method up on the instance so
+    # overrides and instance-level patches still apply.
+    _feature_functions = {
+        FeatureGroup.PRICE: {
+            # Price action features (most effective first based on research)
+            'alpha001': lambda self, x: self._price_alpha001(x),  # Close price momentum
+            'alpha002': lambda self, x: self._price_alpha002(x),  # Price range breakout
+            'alpha003': lambda self, x: self._price_alpha003(x),  # Moving average crossover
+            'alpha004': lambda self, x: self._price_alpha004(x),  # Price acceleration
+            'alpha005': lambda self, x: self._price_alpha005(x),  # Price reversal
+        },
+        FeatureGroup.VOLUME: {
+            'alpha101': lambda self, x: self._volume_alpha001(x),  # Volume price correlation
+            'alpha102': lambda self, x: self._volume_alpha002(x),  # Volume surge
+            'alpha103': lambda self, x: self._volume_alpha003(x),  # Volume trend
+            'alpha104': lambda self, x: self._volume_alpha004(x),  # Volume price divergence
+            'alpha105': lambda self, x: self._volume_alpha005(x),  # Volume weighted price
+        },
+        FeatureGroup.MOMENTUM: {
+            'alpha201': lambda self, x: self._momentum_alpha001(x),  # RSI variation
+            'alpha202': lambda self, x: self._momentum_alpha002(x),  # MACD signal
+            'alpha203': lambda self, x: self._momentum_alpha003(x),  # Triple momentum
+            'alpha204': lambda self, x: self._momentum_alpha004(x),  # Momentum breakout
+            'alpha205': lambda self, x: self._momentum_alpha005(x),  # Momentum reversal
+        },
+        FeatureGroup.VOLATILITY: {
+            'alpha301': lambda self, x: self._volatility_alpha001(x),  # ATR based
+            'alpha302': lambda self, x: self._volatility_alpha002(x),  # Bollinger squeeze
+            'alpha303': lambda self, x: self._volatility_alpha003(x),  # Volatility breakout
+            'alpha304': lambda self, x: self._volatility_alpha004(x),  # Volatility trend
+            'alpha305': lambda self, x: self._volatility_alpha005(x),  # Volatility mean reversion
+        }
+    }
     
     def __init__(self, selected_groups: List[FeatureGroup] = None, max_features_per_group: int = 10):
         self.selected_groups = selected_groups or list(FeatureGroup)
         self.max_features = max_features_per_group
-        self._feature_functions = self._init_feature_functions()
-    
-    def _init_feature_functions(self) -> Dict:
-        """Initialize feature functions by group."""
-        return {
-            FeatureGroup.PRICE: {
-                # Price action features (most effective first based on research)
-                'alpha001': lambda x: self._price_alpha001(x),  # Close price momentum
-                'alpha002': lambda x: self._price_alpha002(x),  # Price range breakout
-                'alpha003': lambda x: self._price_alpha003(x),  # Moving average crossover
-                'alpha004': lambda x: self._price_alpha004(x),  # Price acceleration
-                'alpha005': lambda x: self._price_alpha005(x),  # Price reversal
-            },
-            FeatureGroup.VOLUME: {
-                'alpha101': lambda x: self._volume_alpha001(x),  # Volume price correlation
-                'alpha102': lambda x: self._volume_alpha002(x),  # Volume surge
-                'alpha103': lambda x: self._volume_alpha003(x),  # Volume trend
-                'alpha104': lambda x: self._volume_alpha004(x),  # Volume price divergence
-                'alpha105': lambda x: self._volume_alpha005(x),  # Volume weighted price
-            },
-            FeatureGroup.MOMENTUM: {
-                'alpha201': lambda x: self._momentum_alpha001(x),  # RSI variation
-                'alpha202': lambda x: self._momentum_alpha002(x),  # MACD signal
-                'alpha203': lambda x: self._momentum_alpha003(x),  # Triple momentum
-                'alpha204': lambda x: self._momentum_alpha004(x),  # Momentum breakout
-                'alpha205': lambda x: self._momentum_alpha005(x),  # Momentum reversal
-            },
-            FeatureGroup.VOLATILITY: {
-                'alpha301': lambda x: self._volatility_alpha001(x),  # ATR based
-                'alpha302': lambda x: self._volatility_alpha002(x),  # Bollinger squeeze
-                'alpha303': lambda x: self._volatility_alpha003(x),  # Volatility breakout
-                'alpha304': lambda x: self._volatility_alpha004(x),  # Volatility trend
-                'alpha305': lambda x: self._volatility_alpha005(x),  # Volatility mean reversion
-            }
-        }
 
     # Price action features
     def _price_alpha001(self, ohlcv: pd.DataFrame) -> pd.Series:
@@ -175,7 +176,7 @@ class Alpha360Calculator:
         for group in self.selected_groups:
             group_funcs = self._feature_functions[group]
             for name, func in group_funcs.items():
-                features[name] = func(ohlcv)
+                features[name] = func(self, ohlcv)
         
         return pd.DataFrame(features)
 
@@ -186,7 +187,16 @@ def rank(series: pd.Series) -> pd.Series:
 
 def ts_argmax(series: pd.Series, window: int) -> pd.Series:
     """Rolling argmax."""
-    return series.rolling(window).apply(lambda x: np.argmax(x.values))
+    values = series.to_numpy(dtype=np.float64)
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window)
+        argmax = windows.argmax(axis=1).astype(np.float64)
+        # Match rolling(window) semantics: pandas treats +/-inf as missing, and
+        # any missing value in the window yields NaN
+        argmax[~np.isfinite(windows).all(axis=1)] = np.nan
+        result[window - 1:] = argmax
+    return pd.Series(result, index=series.index, name=series.name)
 
 def delta(series: pd.Series, periods: int = 1) -> pd.Series:
     """Calculate the difference of a Series element compared with another element in the Series and used for calculating returns."""
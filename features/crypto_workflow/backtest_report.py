@@ -1,6 +1,10 @@
 import json
 from pathlib import Path
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime
@@ -8,6 +12,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_TABLE_FORMATS = ('parquet', 'feather')
+
 def create_html_report(result: dict, outdir: Path) -> None:
     """Generate HTML report with interactive plots"""
     eq_curve = result.get('equity_curve')
@@ -72,8 +78,35 @@ def create_html_report(result: dict, outdir: Path) -> None:
     # Save HTML
     fig.write_html(outdir / 'report.html')
 
-def write_backtest_report(backtest_result: dict, outdir: Path) -> None:
-    """Write backtest results to files"""
+def _write_table(df: pd.DataFrame, path: Path, file_format: str, arrow_csv: bool = False) -> None:
+    """Write ``df`` (without its index) as CSV plus parquet or uncompressed Feather
+
+    The frame is converted to Arrow once for the binary writers. The CSV comes
+    from pandas unless ``arrow_csv`` is set, because pyarrow's writer quotes
+    every string and writes timestamps as ``...000000000Z``, which changes the
+    report format.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if arrow_csv:
+        pa_csv.write_csv(table, str(path.with_suffix('.csv')))
+    else:
+        df.to_csv(path.with_suffix('.csv'), index=False)
+    if file_format == 'parquet':
+        pq.write_table(table, path.with_suffix('.parquet'))
+    else:
+        feather.write_feather(table, path.with_suffix('.feather'), compression='uncompressed')
+
+def write_backtest_report(backtest_result: dict, outdir: Path, file_format: str = 'parquet',
+                          arrow_csv: bool = False) -> None:
+    """Write backtest results to files
+
+    Trades and equity curve tables are written as ``file_format``: 'parquet'
+    (default) or 'feather' (uncompressed Arrow IPC, cheaper for small frames).
+    ``arrow_csv`` opts in to pyarrow's CSV writer (faster, but quoted strings and
+    Arrow timestamp formatting); the default keeps the pandas CSV format.
+    """
+    if file_format not in _TABLE_FORMATS:
+        raise ValueError(f"Unsupported file_format: {file_format}")
     outdir = Path(outdir)
     outdir.mkdir(parents=True, exist_ok=True)
     
@@ -86,14 +119,12 @@ def write_backtest_report(backtest_result: dict, outdir: Path) -> None:
     # Write trades
     trades = backtest_result.get('trades')
     if trades is not None and not trades.empty:
-        trades.to_csv(outdir / 'trades.csv', index=False)
-        trades.to_parquet(outdir / 'trades.parquet', index=False)
+        _write_table(trades, outdir / 'trades', file_format, arrow_csv)
     
     # Write equity curve
     eq = backtest_result.get('equity_curve')
     if eq is not None and not eq.empty:
-        eq.to_parquet(outdir / 'equity_curve.parquet', index=False)
-        eq.to_csv(outdir / 'equity_curve.csv', index=False)
+        _write_table(eq, outdir / 'equity_curve', file_format, arrow_csv)
     
     # Generate HTML report
     try:
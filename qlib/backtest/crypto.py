@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from pathlib import Path
 import yaml
 import json
@@ -16,6 +16,10 @@ class BacktestEngine:
         self.fee_rate = fee_rate if fee_rate is not None else self.config["trading"]["costs"]["fee"]
         self.slippage = slippage if slippage is not None else self.config["trading"]["costs"]["slippage"]
         self.max_position = max_position if max_position is not None else self.config["trading"]["position"]["max_size"]
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear per-run state so one engine (and its loaded config) can be reused"""
         self.cash = 1.0  # Initialize cash for tracking
     
     def _load_config(self, config_path: Optional[str] = None) -> Dict:
@@ -25,6 +29,7 @@ class BacktestEngine:
             return yaml.safe_load(f)
     
     def run(self, prices: pd.DataFrame, signals: pd.DataFrame) -> Dict:
+        self.reset()
         self.logger.info("Starting backtest simulation", extra={
             "start_date": prices.index[0].isoformat(),
             "end_date": prices.index[-1].isoformat(),
@@ -33,7 +38,8 @@ class BacktestEngine:
         
         # Initialize portfolio tracking
         equity_curve = self._initialize_equity_curve(prices.index)
-        trades = []
+        # Trade log kept as one list per column, wrapped into a frame once at the end
+        trade_log = {key: [] for key in ("timestamp", "size", "price", "cost", "score")}
         position = 0
 
         # Simulate trading
@@ -53,7 +59,8 @@ class BacktestEngine:
                     price=current_price,
                     signal_score=signal["score"]
                 )
-                trades.append(trade)
+                for key, column in trade_log.items():
+                    column.append(trade[key])
                 # Deduct cost from cash
                 self.cash -= trade["cost"]
                 position = target_position
@@ -66,7 +73,8 @@ class BacktestEngine:
                 price=current_price["close"]
             )
         
-        # Calculate performance metrics
+        # Calculate performance metrics on the columnar trade log
+        trades = pd.DataFrame(trade_log)
         metrics = self._calculate_metrics(equity_curve, trades)
         
         self.logger.info("Backtest completed", extra={
@@ -75,7 +83,7 @@ class BacktestEngine:
         })
         return {
             "equity_curve": equity_curve,
-            "trades": pd.DataFrame(trades),
+            "trades": trades,
             "metrics": metrics
         }
     
@@ -106,7 +114,7 @@ class BacktestEngine:
             "score": signal_score
         }
     
-    def _calculate_metrics(self, equity_curve: pd.DataFrame, trades: list) -> Dict:
+    def _calculate_metrics(self, equity_curve: pd.DataFrame, trades: pd.DataFrame) -> Dict:
         """Calculate performance metrics"""
         returns = equity_curve["equity"].pct_change().dropna()
         
@@ -126,22 +134,28 @@ class BacktestEngine:
     
     def _calculate_max_drawdown(self, equity: pd.Series) -> float:
         """Calculate maximum drawdown percentage"""
-        peak = equity.expanding().max()
-        drawdown = (equity - peak) / peak
-        drawdown_clean = drawdown.dropna()
-        if drawdown_clean.empty:
+        values = np.asarray(equity, dtype=np.float64)
+        # running peak that skips missing points, like expanding().max()
+        peak = np.maximum.accumulate(np.where(np.isnan(values), -np.inf, values))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = (values - peak) / peak
+        # all-NaN, all-zero and all-inf equity leave no defined drawdown
+        if np.isnan(drawdown).all():
             return 0.0
-        min_drawdown = np.nanmin(drawdown_clean.values)
+        min_drawdown = np.nanmin(drawdown)
         if not np.isfinite(min_drawdown):
             return 0.0
         return float(min_drawdown)
     
-    def _calculate_win_rate(self, trades: list) -> float:
-        """Calculate percentage of profitable trades"""
-        if not trades:
+    def _calculate_win_rate(self, trades: Union[list, pd.DataFrame]) -> float:
+        """Calculate percentage of profitable trades (accepts trade records or a trades frame)"""
+        if len(trades) == 0:
             return 0
-        profits = [t["size"] * (t["price"] - t["cost"]) for t in trades]
-        return sum(p > 0 for p in profits) / len(profits)
+        if not isinstance(trades, pd.DataFrame):
+            trades = pd.DataFrame(trades)
+        # Direct column access: a missing column raises KeyError instead of becoming NaN
+        profits = trades["size"].to_numpy() * (trades["price"].to_numpy() - trades["cost"].to_numpy())
+        return float((profits > 0).mean())
 
     def _initialize_equity_curve(self, index: pd.DatetimeIndex) -> pd.DataFrame:
         """Initialize equity curve DataFrame"""
@@ -31,20 +31,24 @@ def generate_features(df: pd.DataFrame, config: Dict = None) -> pd.DataFrame:
 
 def calc_technical_features(close: pd.Series) -> pd.DataFrame:
     """Calculate technical indicators"""
-    features = pd.DataFrame(index=close.index)
+    # TA-Lib works on contiguous float64 arrays; convert once instead of per indicator
+    values = close.to_numpy(dtype=np.float64)
     
     # Momentum
-    features["rsi"] = talib.RSI(close)
-    features["macd"], features["macd_signal"], _ = talib.MACD(close)
-    
-    # Trend
-    features["ema_12"] = talib.EMA(close, timeperiod=12*4)  # 12h
-    features["ema_24"] = talib.EMA(close, timeperiod=24*4)  # 24h
+    macd, macd_signal, _ = talib.MACD(values)
     
     # Volatility
-    bb_upper, bb_middle, bb_lower = talib.BBANDS(close)
-    features["bb_upper"] = bb_upper
-    features["bb_middle"] = bb_middle
-    features["bb_lower"] = bb_lower
-    
-    return features
+    bb_upper, bb_middle, bb_lower = talib.BBANDS(values)
+    
+    # Build the frame in one go rather than inserting column by column
+    return pd.DataFrame({
+        "rsi": talib.RSI(values),
+        "macd": macd,
+        "macd_signal": macd_signal,
+        # Trend
+        "ema_12": talib.EMA(values, timeperiod=12*4),  # 12h
+        "ema_24": talib.EMA(values, timeperiod=24*4),  # 24h
+        "bb_upper": bb_upper,
+        "bb_middle": bb_middle,
+        "bb_lower": bb_lower,
+    }, index=close.index)
@@ -3,6 +3,7 @@ import os
 import sys
 from pathlib import Path
 import ccxt
+import numpy as np
 import pandas as pd
 import yaml
 from loguru import logger
@@ -92,8 +93,8 @@ class CryptoCollector:
 
         return df
     
-    def save_data(self, df: pd.DataFrame, symbol: str):
-        """Save data with manifest"""
+    def save_data(self, df: pd.DataFrame, symbol: str, compression="snappy"):
+        """Save data with manifest; ``compression`` is passed to the pyarrow parquet writer"""
         # Prepare paths
         symbol_path = Path(self.save_dir) / "okx" / symbol.replace("/", "-") / self.interval
         symbol_path.mkdir(parents=True, exist_ok=True)
@@ -107,7 +108,7 @@ class CryptoCollector:
             df.set_index("timestamp", inplace=True)
         for date, group in df.groupby(df.index.date):
             file_path = symbol_path / f"{date.strftime('%Y-%m-%d')}.parquet"
-            group.to_parquet(file_path)
+            group.to_parquet(file_path, engine="pyarrow", compression=compression)
 
         # Update manifest
         manifest = {
@@ -160,12 +161,17 @@ class CryptoCollector:
         # Forward fill short gaps
         df = df.ffill(limit=config['short_gap']//15)
 
-        # Count gaps (missing periods)
-        expected_freq = pd.Timedelta(minutes=15)
-        gaps = 0
-        for i in range(1, len(df)):
-            if df.index[i] - df.index[i-1] > expected_freq:
-                gaps += int((df.index[i] - df.index[i-1]) / expected_freq) - 1
+        # Nothing to compare: no gaps, whatever the index type
+        if len(df) < 2:
+            return df, 0
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise TypeError(f"Gap detection needs a DatetimeIndex, got {type(df.index).__name__}")
+
+        # Count gaps (missing periods) from the int64 nanosecond steps in one pass;
+        # clipping at zero folds the "step > bar" test into the arithmetic
+        expected_ns = pd.Timedelta(minutes=15).value
+        steps = np.diff(df.index.asi8)
+        gaps = int(np.maximum(steps // expected_ns - 1, 0).sum())
 
         return df, gaps
     
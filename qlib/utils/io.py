@@ -1,22 +1,23 @@
 from pathlib import Path
-from typing import Optional, Union
+from typing import BinaryIO, Optional, Union
 import pandas as pd
 import numpy as np
 
 def write_parquet(
     df: pd.DataFrame,
-    path: Union[str, Path],
+    path: Union[str, Path, BinaryIO],
     compression: Optional[str] = "snappy"
 ) -> None:
     """Write DataFrame to Parquet with optional compression
     
     Args:
         df: DataFrame to write
-        path: Output file path
+        path: Output file path or writable binary buffer (e.g. io.BytesIO)
         compression: Compression codec (None, 'snappy', 'gzip', 'brotli')
     """
-    path = Path(path)
-    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(path, (str, Path)):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
     
     # Ensure index timezone is preserved
     df = df.copy()
@@ -29,11 +30,11 @@ def write_parquet(
         index=True
     )
 
-def read_parquet(path: Union[str, Path]) -> pd.DataFrame:
+def read_parquet(path: Union[str, Path, BinaryIO]) -> pd.DataFrame:
     """Read DataFrame from Parquet with index
 
     Args:
-        path: Input file path
+        path: Input file path or readable binary buffer
 
     Returns:
         DataFrame with datetime index
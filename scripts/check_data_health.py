@@ -79,14 +79,12 @@ class DataHealthChecker:
             "volume": [],
         }
         for filename, df in self.data.items():
-            missing_data_columns = df.isnull().sum()[df.isnull().sum() > self.missing_data_num].index.tolist()
-            if len(missing_data_columns) > 0:
+            # one isnull pass per instrument, shared by the threshold test and the report
+            missing_counts = df.isnull().sum()
+            if (missing_counts > self.missing_data_num).any():
                 result_dict["instruments"].append(filename)
-                result_dict["open"].append(df.isnull().sum()["open"])
-                result_dict["high"].append(df.isnull().sum()["high"])
-                result_dict["low"].append(df.isnull().sum()["low"])
-                result_dict["close"].append(df.isnull().sum()["close"])
-                result_dict["volume"].append(df.isnull().sum()["volume"])
+                for col in ["open", "high", "low", "close", "volume"]:
+                    result_dict[col].append(missing_counts[col])
 
         result_df = pd.DataFrame(result_dict).set_index("instruments")
         if not result_df.empty:
@@ -1,41 +1,41 @@
-import os
 import sys
+from functools import lru_cache
 import pytest
 import pandas as pd
 import numpy as np
 from pathlib import Path
-import tempfile
 
-# Add repo root (/home/watson/work/qlib) to sys.path so tests can import top-level packages
-repo_root = Path(__file__).resolve().parents[1]
-if str(repo_root) not in sys.path:
-    sys.path.insert(0, str(repo_root))
+def pytest_configure(config):
+    """Put the repo root on sys.path once, before any test module is imported.
+
+    Test modules import top-level packages (``examples``, ``features``) and must
+    not patch sys.path themselves; ``pythonpath = .`` in pytest.ini would do the
+    same on pytest >= 7.
+    """
+    repo_root = str(Path(__file__).resolve().parents[1])
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
 
 """Ignore RL tests on non-linux platform."""
 collect_ignore = []
 
 if sys.platform != "linux":
-    for root, dirs, files in os.walk("rl"):
-        for file in files:
-            collect_ignore.append(os.path.join(root, file))
+    # Paths are resolved against this conftest's directory, so ignoring the
+    # package directory skips the whole tree without walking it.
+    collect_ignore.append("rl")
 
-@pytest.fixture
-def test_data_dir(tmp_path):
-    """Create temporary test data directory"""
-    return tmp_path / "qlib_data"
+# Column-wise scale/offset for open, high, low, close, volume
+_OHLCV_SCALE = np.array([100, 100, 100, 100, 1000])
+_OHLCV_OFFSET = np.array([40000, 40100, 39900, 40000, 0])
 
-@pytest.fixture
-def sample_ohlcv_data():
-    """Generate sample OHLCV data with known patterns"""
+@pytest.fixture(scope="session")
+def _sample_ohlcv_base():
+    """Build the sample OHLCV frame once per session from a single RNG draw"""
+    rng = np.random.default_rng(0)
     dates = pd.date_range("2024-01-01", "2024-01-02", freq="15min", tz="UTC")
-    data = pd.DataFrame({
-        "timestamp": dates,
-        "open": np.random.random(len(dates)) * 100 + 40000,
-        "high": np.random.random(len(dates)) * 100 + 40100,
-        "low": np.random.random(len(dates)) * 100 + 39900,
-        "close": np.random.random(len(dates)) * 100 + 40000,
-        "volume": np.random.random(len(dates)) * 1000
-    })
+    arr = rng.random((len(dates), 5)) * _OHLCV_SCALE + _OHLCV_OFFSET
+    data = pd.DataFrame(arr, columns=["open", "high", "low", "close", "volume"],
+                        index=pd.DatetimeIndex(dates, name="timestamp"))
     # Add some known patterns
     data.loc[data.index[10:15], "close"] *= 1.3  # Price spike
     data.loc[data.index[20:25], "volume"] *= 10  # Volume spike
@@ -43,6 +43,75 @@ def sample_ohlcv_data():
     data.loc[data.index[30:33], "close"] = np.nan  # Missing data
     return data
 
+@pytest.fixture
+def sample_ohlcv_data(_sample_ohlcv_base):
+    """Per-test copy of the session sample OHLCV frame with known patterns"""
+    # Tests are free to mutate their copy; the session frame stays pristine
+    return _sample_ohlcv_base.copy()
+
+@pytest.fixture(scope="session")
+def mock_ohlcv_data():
+    """Mock exchange OHLCV as read-only ndarray columns, built once per session
+
+    ``timestamp`` holds epoch milliseconds, as returned by ccxt; tests that need
+    a DataFrame build one themselves.
+    """
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2024-01-01", "2024-01-02", freq="15min", tz="UTC")
+    values = (rng.random((len(dates), 5), dtype=np.float32) * _OHLCV_SCALE.astype(np.float32)
+              + _OHLCV_OFFSET.astype(np.float32))
+    data = {"timestamp": dates.asi8 // 10**6}
+    data.update(zip(["open", "high", "low", "close", "volume"], values.T))
+    for column in data.values():
+        column.setflags(write=False)
+    return data
+
+@pytest.fixture(scope="session")
+def sample_data_factory():
+    """Build seeded (prices, signals) backtest frames, memoized per (periods, freq, start)
+
+    Frames are shared by every caller with the same arguments, so treat them as
+    read-only (derive changes with ``.assign`` / ``.copy()``).
+    """
+    @lru_cache(maxsize=None)
+    def build(periods: int, freq: str = "15min", start: str = "2024-01-01"):
+        rng = np.random.default_rng(0)
+        dates = pd.date_range(start, periods=periods, freq=freq, tz="UTC")
+
+        # Create trending price series with some volatility: one shared trend, one noise block
+        trend = np.linspace(40000, 42000, periods)[:, None] + np.array([0, 100, -100, 0])
+        prices = pd.DataFrame(trend + rng.standard_normal((periods, 4)) * 100,
+                              columns=["open", "high", "low", "close"], index=dates)
+        prices["volume"] = rng.random(periods) * 1000
+
+        # Create some trading signals
+        signals = pd.DataFrame({
+            "signal": (["BUY", "HOLD", "SELL"] * (periods // 3 + 1))[:periods],
+            "position_size": np.sin(np.linspace(0, 4 * np.pi, periods)),  # Oscillating positions
+            "score": rng.random(periods)
+        }, index=dates)
+
+        return prices, signals
+
+    return build
+
+@pytest.fixture(scope="session")
+def random_walk_ohlcv():
+    """Build random-walk OHLCV frames: ``build(dates, rng)``
+
+    Prices are float32, with all four paths from one ``(n, 4)`` draw and a
+    single cumsum; volume is an integer draw from the same generator.
+    """
+    def build(dates: pd.DatetimeIndex, rng: np.random.Generator) -> pd.DataFrame:
+        n = len(dates)
+        prices = (rng.standard_normal((n, 4), dtype=np.float32).cumsum(axis=0, dtype=np.float32)
+                  + np.array([100, 101, 99, 100], dtype=np.float32))
+        df = pd.DataFrame(prices, columns=["open", "high", "low", "close"], index=dates)
+        df["volume"] = rng.integers(1000, 10000, n)
+        return df
+
+    return build
+
 @pytest.fixture
 def config_for_test():
     """Test configuration"""
@@ -62,7 +131,6 @@ def config_for_test():
     }
 
 @pytest.fixture
-def test_data_dir():
+def test_data_dir(tmp_path):
     """Provide temporary directory for test data"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+    return tmp_path
@@ -1,21 +1,53 @@
+import os
 import pytest
 import pandas as pd
 import numpy as np
 import time
+from filelock import FileLock
 from features.crypto_workflow.alpha360 import Alpha360Calculator, FeatureGroup, rank, ts_argmax, delta, correlation, ts_rank
 
-@pytest.fixture
-def sample_ohlcv():
-    """Create sample OHLCV data."""
-    dates = pd.date_range('2023-01-01', '2023-01-31', freq='1h')
-    df = pd.DataFrame({
-        'open': np.random.randn(len(dates)).cumsum() + 100,
-        'high': np.random.randn(len(dates)).cumsum() + 101,
-        'low': np.random.randn(len(dates)).cumsum() + 99,
-        'close': np.random.randn(len(dates)).cumsum() + 100,
-        'volume': np.random.randint(1000, 10000, len(dates))
-    }, index=dates)
-    return df
+# Hourly January 2023 index shared by the small fixtures (DatetimeIndex is immutable)
+_JAN_2023_HOURLY = pd.date_range('2023-01-01', '2023-01-31', freq='1h')
+
+@pytest.fixture(scope="session")
+def big_ohlcv(tmp_path_factory, random_walk_ohlcv):
+    """Four years of hourly random-walk OHLCV, built once per test run.
+
+    Under pytest-xdist each worker has its own session, so the frame is cached
+    as parquet in the temp root shared by the workers and only the first worker
+    to take the lock builds it.
+    """
+    root = tmp_path_factory.getbasetemp()
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        root = root.parent
+    path = root / "big_ohlcv.parquet"
+    with FileLock(str(path) + ".lock"):
+        if not path.exists():
+            dates = pd.date_range('2020-01-01', '2023-12-31', freq='1h')
+            random_walk_ohlcv(dates, np.random.default_rng(0)).to_parquet(path)
+    return pd.read_parquet(path)
+
+@pytest.fixture(scope="module")
+def sample_ohlcv(random_walk_ohlcv):
+    """Create sample OHLCV data (seeded, shared read-only across the module)."""
+    return random_walk_ohlcv(_JAN_2023_HOURLY, np.random.default_rng(42))
+
+@pytest.fixture(scope="module")
+def all_features(sample_ohlcv):
+    """All-group features for sample_ohlcv, computed once per module."""
+    return Alpha360Calculator().calculate_features(sample_ohlcv)
+
+@pytest.fixture(scope="module")
+def features_by_group(sample_ohlcv):
+    """Single-group features for sample_ohlcv, each group computed once per module."""
+    return {group: Alpha360Calculator(selected_groups=[group]).calculate_features(sample_ohlcv)
+            for group in FeatureGroup}
+
+@pytest.fixture(scope="session")
+def process():
+    """psutil handle for the current process; skips when psutil is unavailable."""
+    psutil = pytest.importorskip("psutil")
+    return psutil.Process()
 
 def test_alpha360_calculator_init():
     """Test Alpha360Calculator initialization."""
@@ -27,57 +59,28 @@ def test_alpha360_calculator_init():
     assert calculator_custom.selected_groups == [FeatureGroup.PRICE]
     assert calculator_custom.max_features == 5
 
-def test_calculate_features_price_group(sample_ohlcv):
-    """Test calculate_features for PRICE group."""
-    calculator = Alpha360Calculator(selected_groups=[FeatureGroup.PRICE])
-    features = calculator.calculate_features(sample_ohlcv)
+@pytest.mark.parametrize("group, expected_columns, bounded", [
+    (FeatureGroup.PRICE, ['alpha001', 'alpha002', 'alpha003', 'alpha004', 'alpha005'], True),
+    (FeatureGroup.VOLUME, ['alpha101', 'alpha102', 'alpha103', 'alpha104', 'alpha105'], False),
+    (FeatureGroup.MOMENTUM, ['alpha201', 'alpha202', 'alpha203', 'alpha204', 'alpha205'], False),
+    (FeatureGroup.VOLATILITY, ['alpha301', 'alpha302', 'alpha303', 'alpha304', 'alpha305'], False),
+])
+def test_calculate_features_group(features_by_group, group, expected_columns, bounded):
+    """Test calculate_features for a single group."""
+    features = features_by_group[group]
 
-    expected_columns = ['alpha001', 'alpha002', 'alpha003', 'alpha004', 'alpha005']
     assert list(features.columns) == expected_columns
     for col in features.columns:
         assert isinstance(features[col], pd.Series)
         assert not features[col].isnull().all()
-        # Assuming alphas are normalized to [-1, 1] or similar
-        assert features[col].min() >= -1
-        assert features[col].max() <= 1
+        if bounded:
+            # Assuming alphas are normalized to [-1, 1] or similar
+            assert features[col].min() >= -1
+            assert features[col].max() <= 1
 
-def test_calculate_features_volume_group(sample_ohlcv):
-    """Test calculate_features for VOLUME group."""
-    calculator = Alpha360Calculator(selected_groups=[FeatureGroup.VOLUME])
-    features = calculator.calculate_features(sample_ohlcv)
-
-    expected_columns = ['alpha101', 'alpha102', 'alpha103', 'alpha104', 'alpha105']
-    assert list(features.columns) == expected_columns
-    for col in features.columns:
-        assert isinstance(features[col], pd.Series)
-        assert not features[col].isnull().all()
-
-def test_calculate_features_momentum_group(sample_ohlcv):
-    """Test calculate_features for MOMENTUM group."""
-    calculator = Alpha360Calculator(selected_groups=[FeatureGroup.MOMENTUM])
-    features = calculator.calculate_features(sample_ohlcv)
-
-    expected_columns = ['alpha201', 'alpha202', 'alpha203', 'alpha204', 'alpha205']
-    assert list(features.columns) == expected_columns
-    for col in features.columns:
-        assert isinstance(features[col], pd.Series)
-        assert not features[col].isnull().all()
-
-def test_calculate_features_volatility_group(sample_ohlcv):
-    """Test calculate_features for VOLATILITY group."""
-    calculator = Alpha360Calculator(selected_groups=[FeatureGroup.VOLATILITY])
-    features = calculator.calculate_features(sample_ohlcv)
-
-    expected_columns = ['alpha301', 'alpha302', 'alpha303', 'alpha304', 'alpha305']
-    assert list(features.columns) == expected_columns
-    for col in features.columns:
-        assert isinstance(features[col], pd.Series)
-        assert not features[col].isnull().all()
-
-def test_calculate_features_all_groups(sample_ohlcv):
+def test_calculate_features_all_groups(all_features):
     """Test calculate_features for all groups."""
-    calculator = Alpha360Calculator()
-    features = calculator.calculate_features(sample_ohlcv)
+    features = all_features
 
     # All groups: PRICE (5), VOLUME (5), MOMENTUM (5), VOLATILITY (5) = 20 features
     assert len(features.columns) == 20
@@ -86,10 +89,9 @@ def test_calculate_features_all_groups(sample_ohlcv):
         assert not features[col].isnull().all()
 
 @pytest.mark.parametrize("group", list(FeatureGroup))
-def test_feature_group_properties(sample_ohlcv, group):
+def test_feature_group_properties(features_by_group, group):
     """Test each feature group properties."""
-    calculator = Alpha360Calculator(selected_groups=[group])
-    features = calculator.calculate_features(sample_ohlcv)
+    features = features_by_group[group]
 
     assert len(features.columns) > 0
     for col in features.columns:
@@ -118,6 +120,9 @@ def test_helper_functions():
     # Test ts_argmax
     argmax_series = ts_argmax(series, 3)
     assert isinstance(argmax_series, pd.Series)
+    noisy = pd.Series([1.0, 3.0, np.nan, 2.0, 5.0, 4.0, np.inf, 1.0, 0.0, 2.0])
+    expected = noisy.rolling(3).apply(lambda x: np.argmax(x.values))
+    pd.testing.assert_series_equal(ts_argmax(noisy, 3), expected)
 
     # Test correlation
     series2 = pd.Series([5, 4, 3, 2, 1])
@@ -128,45 +133,44 @@ def test_helper_functions():
     ts_ranked = ts_rank(series, 3)
     assert isinstance(ts_ranked, pd.Series)
 
-def test_feature_correlation(sample_ohlcv):
+def test_feature_correlation(all_features):
     """Test feature correlations are not too high."""
-    calculator = Alpha360Calculator()
-    features = calculator.calculate_features(sample_ohlcv)
-
     # Remove NaN rows
-    features = features.iloc[60:]
+    features = all_features.iloc[60:]
 
-    # Calculate correlation matrix
-    corr = features.corr()
+    # Calculate correlation matrix (constant columns give NaN, which never trips the check)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = np.corrcoef(features.dropna().to_numpy(), rowvar=False)
 
-    # Check no features are too highly correlated (>0.95)
-    high_corr = np.where(np.abs(corr) > 0.95)
-    high_corr_pairs = list(zip(high_corr[0], high_corr[1]))
-
-    # Exclude self-correlations
+    # Check no features are too highly correlated (>0.95); the strict upper
+    # triangle skips self-correlations and mirrored pairs
+    iu, ju = np.triu_indices_from(corr, k=1)
+    mask = np.abs(corr[iu, ju]) > 0.95
     high_corr_pairs = [(features.columns[i], features.columns[j])
-                       for i, j in high_corr_pairs
-                       if i < j]
+                       for i, j in zip(iu[mask], ju[mask])]
 
     assert len(high_corr_pairs) == 0, f"Found highly correlated features: {high_corr_pairs}"
 
-def test_feature_importance(sample_ohlcv):
+def test_feature_importance(sample_ohlcv, all_features):
     """Test feature importance ranking."""
-    calculator = Alpha360Calculator()
-    features = calculator.calculate_features(sample_ohlcv)
-
     # Create synthetic target (next period returns)
     target = sample_ohlcv['close'].pct_change().shift(-1)
 
     # Remove NaN rows
-    features = features.iloc[60:-1]
+    features = all_features.iloc[60:-1]
     target = target.iloc[60:-1]
 
-    # Calculate IC (Information Coefficient)
-    ic = pd.DataFrame({col: features[col].corr(target) for col in features.columns}, index=['IC'])
+    # Calculate IC (Information Coefficient) for all features in one matrix product
+    F = features.to_numpy(dtype=np.float64)
+    t = target.to_numpy(dtype=np.float64)
+    mask = np.isfinite(F).all(axis=1) & np.isfinite(t)
+    F, t = F[mask], t[mask]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        F_std = (F - F.mean(axis=0)) / F.std(axis=0)
+        ic = pd.Series(F_std.T @ ((t - t.mean()) / t.std()) / len(t), index=features.columns)
 
     # Verify some features have meaningful IC (relaxed threshold for synthetic data)
-    assert (abs(ic) > 0.05).any().any(), "No features show meaningful predictive power"
+    assert (ic.abs() > 0.05).any(), "No features show meaningful predictive power"
 
 def test_all_alpha_functions_existence():
     """Test all alpha functions are implemented and accessible."""
@@ -192,72 +196,51 @@ def test_error_handling_invalid_data(sample_ohlcv):
     bad_df = sample_ohlcv.copy()
     bad_df.loc[bad_df.index[0:10], 'close'] = np.nan
     features = calculator.calculate_features(bad_df)
-    assert not features.isnull().all().all(), "All features should not be NaN"
+    assert not np.isnan(features.to_numpy(dtype=np.float64)).all(), "All features should not be NaN"
 
-def test_feature_computation_speed():
+def test_feature_computation_speed(big_ohlcv):
     """Test feature computation performance."""
-    # Create larger dataset
-    dates = pd.date_range('2020-01-01', '2023-12-31', freq='1h')
-    df = pd.DataFrame({
-        'open': np.random.randn(len(dates)).cumsum() + 100,
-        'high': np.random.randn(len(dates)).cumsum() + 101,
-        'low': np.random.randn(len(dates)).cumsum() + 99,
-        'close': np.random.randn(len(dates)).cumsum() + 100,
-        'volume': np.random.randint(1000, 10000, len(dates))
-    }, index=dates)
-    
-    calculator = Alpha360Calculator()
-    
+    df = big_ohlcv
+
+    # Warm-up on a small slice so first-call costs (lazy imports, allocator) are not timed
+    Alpha360Calculator().calculate_features(df.iloc[:1000])
+
     # Measure computation time
-    start_time = time.time()
-    features = calculator.calculate_features(df)
-    end_time = time.time()
-    
-    computation_time = end_time - start_time
+    calculator = Alpha360Calculator()
+    start_time = time.perf_counter()
+    calculator.calculate_features(df)
+    computation_time = time.perf_counter() - start_time
     rows_per_second = len(df) / computation_time
     
     # Performance assertions
     assert computation_time < 60, f"Feature computation took too long: {computation_time:.2f}s"
     assert rows_per_second > 1000, f"Processing speed too slow: {rows_per_second:.0f} rows/s"
 
-def test_memory_usage():
+def test_memory_usage(process, big_ohlcv):
     """Test memory usage during feature computation."""
-    import psutil
-    import os
-    
-    process = psutil.Process(os.getpid())
+    # Medium-sized dataset: the last two years of the shared frame
+    df = big_ohlcv.loc['2022-01-01':]
     initial_memory = process.memory_info().rss
     
-    # Create medium-sized dataset
-    dates = pd.date_range('2022-01-01', '2023-12-31', freq='1h')
-    df = pd.DataFrame({
-        'open': np.random.randn(len(dates)).cumsum() + 100,
-        'high': np.random.randn(len(dates)).cumsum() + 101,
-        'low': np.random.randn(len(dates)).cumsum() + 99,
-        'close': np.random.randn(len(dates)).cumsum() + 100,
-        'volume': np.random.randint(1000, 10000, len(dates))
-    }, index=dates)
-    
     calculator = Alpha360Calculator()
     features = calculator.calculate_features(df)
     
     peak_memory = process.memory_info().rss
     memory_increase = (peak_memory - initial_memory) / (1024 * 1024)  # MB
     
-    # Memory usage assertions
-    assert memory_increase < 1000, f"Memory usage too high: {memory_increase:.1f}MB"
+    # Only feature computation is measured (the input frame is built by the fixture);
+    # it takes a few MB for two years of hourly bars
+    assert memory_increase < 100, f"Memory usage too high: {memory_increase:.1f}MB"
 
 def test_numerical_stability():
     """Test numerical stability with extreme values."""
-    dates = pd.date_range('2023-01-01', '2023-01-31', freq='1h')
+    dates = _JAN_2023_HOURLY
     n = len(dates)
-    df = pd.DataFrame({
-        'open': [1e9, 1e-9] * (n // 2) + [1e9] if n % 2 else [],
-        'high': [1e9, 1e-9] * (n // 2) + [1e9] if n % 2 else [],
-        'low': [1e9, 1e-9] * (n // 2) + [1e9] if n % 2 else [],
-        'close': [1e9, 1e-9] * (n // 2) + [1e9] if n % 2 else [],
-        'volume': [1e9, 1e-9] * (n // 2) + [1e9] if n % 2 else []
-    }, index=dates)
+    # Alternate 1e9 / 1e-9 in every column; the test only reads, so one buffer is shared
+    base = np.empty(n)
+    base[0::2] = 1e9
+    base[1::2] = 1e-9
+    df = pd.DataFrame({col: base for col in ['open', 'high', 'low', 'close', 'volume']}, index=dates)
 
     calculator = Alpha360Calculator()
     features = calculator.calculate_features(df)
@@ -273,31 +256,23 @@ def test_numerical_stability():
     valid_features = ~nan_columns
     assert valid_features.any(), "No features have any valid values"
 
-def test_feature_consistency():
-    """Test feature consistency with different data sizes."""
+def test_feature_consistency(random_walk_ohlcv):
+    """Test feature consistency across independent equal-size datasets."""
     calculator = Alpha360Calculator()
-
-    # Calculate features for different data sizes
-    sizes = [200, 400, 800]  # Start with larger sizes to avoid NaN issues
-    results = []
-
-    for size in sizes:
-        dates = pd.date_range('2023-01-01', periods=size, freq='1h')
-        df = pd.DataFrame({
-            'open': np.random.randn(size).cumsum() + 100,
-            'high': np.random.randn(size).cumsum() + 101,
-            'low': np.random.randn(size).cumsum() + 99,
-            'close': np.random.randn(size).cumsum() + 100,
-            'volume': np.random.randint(1000, 10000, size)
-        }, index=dates)
-
-        features = calculator.calculate_features(df)
-        results.append(features.iloc[-100:])  # Compare last 100 rows
-
-    # Check feature consistency (relaxed threshold for synthetic data)
-    for i in range(len(results)-1):
-        for col in results[i].columns:
-            correlation = results[i][col].corr(results[i+1][col])
-            # Skip if correlation is NaN (due to constant values)
-            if not np.isnan(correlation):
-                assert correlation > 0.95, f"Feature {col} not consistent across different data sizes: {correlation:.3f}"
+    dates = pd.date_range('2023-01-01', periods=400, freq='1h')
+
+    # Same size, different seeds: each block is computed exactly once
+    blocks = [calculator.calculate_features(random_walk_ohlcv(dates, np.random.default_rng(seed)))
+              for seed in range(3)]
+
+    for seed, features in enumerate(blocks):
+        tail = features.iloc[-100:]  # Every look-back window is filled by the last 100 rows
+        assert list(tail.columns) == list(blocks[0].columns)
+        assert tail.notna().all().all(), f"NaN after warm-up (seed {seed}): {tail.columns[tail.isna().any()].tolist()}"
+        assert np.isfinite(tail.to_numpy(dtype=np.float64)).all(), f"Infinite feature values (seed {seed})"
+
+    # Each feature's lag-1 autocorrelation is set by its window lengths, not by the
+    # particular path, so the per-feature profile should match from seed to seed
+    profiles = pd.concat([features.apply(lambda s: s.autocorr(1)) for features in blocks], axis=1)
+    correlation = profiles.corr()
+    assert (correlation.to_numpy() > 0.9).all(), f"Feature autocorrelation profiles differ across seeds: {correlation.round(3).to_dict()}"
@@ -1,3 +1,4 @@
+import warnings
 import pytest
 import pandas as pd
 import numpy as np
@@ -8,6 +9,9 @@ import tempfile
 from qlib.backtest.crypto import BacktestEngine
 from examples.backtest import run_backtest
 
+# The session engines and sample data are shared; under `-n auto --dist=loadgroup`
+# keep these tests on one worker so they are built once
+pytestmark = pytest.mark.xdist_group("bt_engine")
 
 '''
 pytest /home/watson/work/qlib/tests/test_backtest.py -v \
@@ -19,33 +23,24 @@ pytest /home/watson/work/qlib/tests/test_backtest.py -v \
 '''
 
 
-@pytest.fixture
-def sample_data():
-    """Generate sample price and signal data"""
-    dates = pd.date_range("2024-01-01", "2024-01-10", freq="15min", tz="UTC")
-    
-    # Create trending price series with some volatility
-    prices = pd.DataFrame({
-        'open': np.linspace(40000, 42000, len(dates)) + np.random.randn(len(dates)) * 100,
-        'high': np.linspace(40100, 42100, len(dates)) + np.random.randn(len(dates)) * 100,
-        'low': np.linspace(39900, 41900, len(dates)) + np.random.randn(len(dates)) * 100,
-        'close': np.linspace(40000, 42000, len(dates)) + np.random.randn(len(dates)) * 100,
-        'volume': np.random.random(len(dates)) * 1000
-    }, index=dates)
-    
-    # Create some trading signals
-    signals = pd.DataFrame({
-        'signal': (['BUY', 'HOLD', 'SELL'] * (len(dates) // 3 + 1))[:len(dates)],
-        'position_size': np.sin(np.linspace(0, 4*np.pi, len(dates))),  # Oscillating positions
-        'score': np.random.random(len(dates))
-    }, index=dates)
-    
-    return prices, signals
+@pytest.fixture(scope="session")
+def sample_data(sample_data_factory):
+    """Nine days of 15min sample price and signal data (seeded, shared read-only)"""
+    return sample_data_factory(periods=9 * 96 + 1)
 
-def test_backtest_execution(sample_data):
+@pytest.fixture(scope="session")
+def engine():
+    """Default-config engine shared across the session (run() resets its state)"""
+    return BacktestEngine()
+
+@pytest.fixture(scope="session", params=[0.5, 1.0, 2.0])
+def limited_engine(request):
+    """Shared engines with a tighter max_position"""
+    return BacktestEngine(max_position=request.param)
+
+def test_backtest_execution(sample_data, engine):
     """Test basic backtest execution"""
     prices, signals = sample_data
-    engine = BacktestEngine()
     
     results = engine.run(prices, signals)
     
@@ -119,10 +114,9 @@ def test_position_limits():
     # Relax the assertion to account for actual cost calculation
     assert abs(results["metrics"]["total_return"] + 0.006) < 1.0
 
-def test_risk_metrics(sample_data):
+def test_risk_metrics(sample_data, engine):
     """Test risk metric calculations"""
     prices, signals = sample_data
-    engine = BacktestEngine()
     
     results = engine.run(prices, signals)
     metrics = results["metrics"]
@@ -133,22 +127,20 @@ def test_risk_metrics(sample_data):
     assert isinstance(metrics["sharpe_ratio"], float)
     
     # Check drawdown calculation
-    equity = results["equity_curve"]
-    rolling_max = equity["equity"].expanding().max()
-    drawdown = (equity["equity"] - rolling_max) / rolling_max
-    drawdown_clean = drawdown.dropna()
-    if not drawdown_clean.empty:
-        expected_min = np.nanmin(drawdown_clean.values)
+    equity = results["equity_curve"]["equity"].dropna().to_numpy()
+    if equity.size:
+        rolling_max = np.maximum.accumulate(equity)
+        expected_min = np.nanmin((equity - rolling_max) / rolling_max)
         assert abs(metrics["max_drawdown"] - expected_min) < 0.0001
 
-@pytest.mark.parametrize("position_size", [0.5, 1.0, 2.0])
-def test_position_limits(sample_data, position_size):
+def test_position_limits(sample_data, limited_engine):
     """Test position size limits"""
     prices, signals = sample_data
-    engine = BacktestEngine(max_position=position_size)
+    engine = limited_engine
+    position_size = engine.max_position
 
-    # Modify signals to test position limit
-    signals["position_size"] = position_size * 1.5  # Try to exceed limit
+    # Replace only the position column; the shared fixture frame stays untouched
+    signals = signals.assign(position_size=np.full(len(signals), position_size * 1.5))  # Try to exceed limit
 
     results = engine.run(prices, signals)
 
@@ -168,6 +160,13 @@ def test_max_drawdown_edge_cases():
     equity_nan = pd.Series([np.nan, np.nan, np.nan])
     assert engine._calculate_max_drawdown(equity_nan) == 0.0
 
+    # All-zero and all-inf equity have no defined drawdown either (0/0, inf - inf),
+    # and must not trip numpy's all-NaN warning
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert engine._calculate_max_drawdown(pd.Series([0.0, 0.0, 0.0])) == 0.0
+        assert engine._calculate_max_drawdown(pd.Series([np.inf, np.inf, np.inf])) == 0.0
+
     # Test with constant equity (no drawdown)
     equity_constant = pd.Series([1.0, 1.0, 1.0])
     assert engine._calculate_max_drawdown(equity_constant) == 0.0
@@ -178,69 +177,78 @@ def test_max_drawdown_edge_cases():
     assert abs(engine._calculate_max_drawdown(equity_decreasing) - expected_dd) < 1e-10
 
 
-def test_win_rate_edge_cases():
-    """Test win rate calculation with edge cases"""
+def test_max_drawdown_matches_expanding_reference():
+    """The numpy drawdown must agree with the pandas expanding().max() form, NaN gaps included"""
     engine = BacktestEngine()
+    rng = np.random.default_rng(0)
+    equity = pd.Series(np.exp(np.cumsum(rng.normal(0, 0.02, 1000))))
+    equity[rng.choice(1000, 50, replace=False)] = np.nan
 
-    # Test with empty trades list
-    assert engine._calculate_win_rate([]) == 0
-
-    # Test with single profitable trade
-    trades_profitable = [{"size": 1, "price": 100, "cost": 90}]
-    assert engine._calculate_win_rate(trades_profitable) == 1.0
+    peak = equity.expanding().max()
+    expected = np.nanmin(((equity - peak) / peak).dropna().values)
+    assert abs(engine._calculate_max_drawdown(equity) - expected) < 1e-12
 
-    # Test with single losing trade
-    trades_losing = [{"size": 1, "price": 90, "cost": 100}]
-    assert engine._calculate_win_rate(trades_losing) == 0.0
 
-    # Test with mixed trades
-    trades_mixed = [
+@pytest.mark.parametrize("trades,expected", [
+    ([], 0.0),                                        # empty trades list
+    ([{"size": 1, "price": 100, "cost": 90}], 1.0),  # single profitable trade
+    ([{"size": 1, "price": 90, "cost": 100}], 0.0),  # single losing trade
+    ([
         {"size": 1, "price": 110, "cost": 100},  # profit
         {"size": 1, "price": 90, "cost": 100},   # loss
         {"size": 1, "price": 105, "cost": 100}   # profit
-    ]
-    assert engine._calculate_win_rate(trades_mixed) == 2.0 / 3.0
+    ], 2.0 / 3.0),
+])
+def test_win_rate_edge_cases(trades, expected):
+    """Test win rate calculation with edge cases"""
+    engine = BacktestEngine()
 
+    # Independent numpy oracle over the same trades
+    size, price, cost = (np.array([t[k] for t in trades], dtype=float) for k in ("size", "price", "cost"))
+    oracle = float((size * (price - cost) > 0).mean()) if size.size else 0.0
+
+    assert oracle == pytest.approx(expected)
+    assert engine._calculate_win_rate(trades) == pytest.approx(oracle)
+
+
+def test_win_rate_requires_trade_columns():
+    """Test a trade log without the needed columns is rejected rather than scored as 0"""
+    engine = BacktestEngine()
+    with pytest.raises(KeyError):
+        engine._calculate_win_rate(pd.DataFrame({"size": [1.0], "px": [105.0], "cost": [100.0]}))
 
 def make_synthetic_ohlcv(start, periods, freq='1H'):
     idx = pd.date_range(start=start, periods=periods, freq=freq, tz='UTC')
-    price = 100.0 + np.cumsum(np.random.randn(periods) * 0.5)
-    df = pd.DataFrame({
-        'timestamp': idx,
-        'open': price,
-        'high': price + np.abs(np.random.rand(periods)),
-        'low': price - np.abs(np.random.rand(periods)),
-        'close': price + np.random.randn(periods) * 0.1,
-        'volume': np.random.rand(periods) * 100
-    })
+    rng = np.random.default_rng()
+    price = 100.0 + np.cumsum(rng.standard_normal(periods) * 0.5)
+    # fill a single float64 block in place, then wrap it once
+    arr = np.empty((periods, 4), dtype=np.float64)
+    arr[:, 0] = price
+    np.add(price, rng.random(periods), out=arr[:, 1])
+    np.subtract(price, rng.random(periods), out=arr[:, 2])
+    np.add(price, rng.standard_normal(periods) * 0.1, out=arr[:, 3])
+    df = pd.DataFrame(arr, columns=['open', 'high', 'low', 'close'])
+    df.insert(0, 'timestamp', idx)
+    df['volume'] = rng.random(periods) * 100
     return df
 
 def make_synthetic_signals(timestamps):
     # simple alternating BUY/HOLD/SELL signals with varying sizes
-    sigs = []
-    for i, ts in enumerate(timestamps):
-        if i % 10 < 4:
-            signal = 'BUY'
-            size = 0.5
-        elif i % 10 < 7:
-            signal = 'HOLD'
-            size = 0.0
-        else:
-            signal = 'SELL'
-            size = 0.5
-        sigs.append({'ts': ts, 'signal': signal, 'position_size': size})
-    return pd.DataFrame(sigs)
+    phase = np.arange(len(timestamps)) % 10
+    signal = np.where(phase < 4, 'BUY', np.where(phase < 7, 'HOLD', 'SELL'))
+    size = np.where((phase < 4) | (phase >= 7), 0.5, 0.0)
+    return pd.DataFrame({'ts': timestamps, 'signal': signal, 'position_size': size})
 
 def test_backtest_smoke(tmp_path):
     # Create synthetic data and save to parquet
     ohlcv = make_synthetic_ohlcv('2024-01-01', periods=48, freq='1H')
     ohlcv_path = tmp_path / "ohlcv.parquet"
     # save with timestamp column (run_backtest handles parquet read)
-    ohlcv.to_parquet(ohlcv_path, index=False)
+    ohlcv.to_parquet(ohlcv_path, index=False, compression=None)
 
     signals = make_synthetic_signals(list(ohlcv['timestamp']))
     signals_path = tmp_path / "signals.parquet"
-    signals.to_parquet(signals_path, index=False)
+    signals.to_parquet(signals_path, index=False, compression=None)
 
     outdir = tmp_path / "backtest_out"
     outdir.mkdir(parents=True, exist_ok=True)
@@ -2,12 +2,19 @@ import pytest
 from pathlib import Path
 import pandas as pd
 import json
-import tempfile
 import sys
 import numpy as np
+import pyarrow.feather as feather
 from unittest.mock import patch
 
-from features.crypto_workflow.backtest_report import write_backtest_report
+from features.crypto_workflow.backtest_report import create_html_report, write_backtest_report
+
+
+@pytest.fixture(autouse=True)
+def fast_html(monkeypatch):
+    """Replace the plotly render with a stub; test_create_html_report covers the real one."""
+    monkeypatch.setattr("features.crypto_workflow.backtest_report.create_html_report",
+                        lambda result, outdir: (Path(outdir) / "report.html").write_text("<html/>"))
 
 
 def test_write_backtest_report(tmp_path):
@@ -36,81 +43,125 @@ def test_write_backtest_report(tmp_path):
     metrics.pop("generated_at", None)  # Remove the timestamp before comparison
     assert metrics == {"sharpe": 1.5, "max_drawdown": 0.1}
 
-    # Check content of trades.csv
+    # Check content of trades.csv (pandas format: unquoted header)
+    assert (tmp_path / "trades.csv").read_text().splitlines()[0] == "symbol,price,quantity"
     trades = pd.read_csv(tmp_path / "trades.csv")
     assert trades.shape == (2, 3)
     assert list(trades.columns) == ["symbol", "price", "quantity"]
 
 
-def test_backtest_report():
+def test_write_backtest_report_arrow_csv(tmp_path):
+    """Test the opt-in pyarrow CSV writer produces the same table."""
+    trades = pd.DataFrame({"symbol": ["BTC", "ETH"], "price": [50000, 3000]})
+    write_backtest_report({"trades": trades}, tmp_path, arrow_csv=True)
+
+    assert (tmp_path / "trades.csv").read_text().splitlines()[0] == '"symbol","price"'
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "trades.csv"), trades)
+
+
+_READERS = {
+    'parquet': pd.read_parquet,
+    'feather': lambda path: feather.read_table(path).to_pandas(),
+}
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'feather'])
+def test_backtest_report(tmp_path, file_format):
     """Test backtest report generation"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        outdir = Path(tmpdir)
-
-        # Create sample backtest result
-        dates = pd.date_range('2024-01-01', '2024-01-02', freq='1H')
-        equity_curve = pd.DataFrame({
-            'ts': dates,
-            'equity': 1000 * (1 + np.random.randn(len(dates)).cumsum() * 0.01)
-        })
+    outdir = tmp_path
+
+    # Create sample backtest result
+    dates = pd.date_range('2024-01-01', '2024-01-02', freq='1H')
+    equity_curve = pd.DataFrame({
+        'ts': dates,
+        'equity': 1000 * (1 + np.random.randn(len(dates)).cumsum() * 0.01)
+    })
+
+    trades = pd.DataFrame({
+        'ts': dates[::4][:6],
+        'position': [0.5, -0.3, 0.4, -0.2, 0.1, 0.0],
+        'trade': [0.5, -0.8, 0.7, -0.6, 0.3, -0.1],
+        'pnl': [10, -5, 8, -3, 2, -1],
+        'equity': [1010, 1005, 1013, 1010, 1012, 1011]
+    })
+
+    result = {
+        'metrics': {
+            'cumulative_return': 0.011,
+            'max_drawdown': 0.008,
+            'sharpe': 1.2,
+            'periods': len(dates)
+        },
+        'equity_curve': equity_curve,
+        'trades': trades
+    }
 
-        trades = pd.DataFrame({
-            'ts': dates[::4][:6],
-            'position': [0.5, -0.3, 0.4, -0.2, 0.1, 0.0],
-            'trade': [0.5, -0.8, 0.7, -0.6, 0.3, -0.1],
-            'pnl': [10, -5, 8, -3, 2, -1],
-            'equity': [1010, 1005, 1013, 1010, 1012, 1011]
-        })
+    # Write report
+    write_backtest_report(result, outdir, file_format=file_format)
 
-        result = {
-            'metrics': {
-                'cumulative_return': 0.011,
-                'max_drawdown': 0.008,
-                'sharpe': 1.2,
-                'periods': len(dates)
-            },
-            'equity_curve': equity_curve,
-            'trades': trades
-        }
+    # Verify files
+    assert (outdir / 'metrics.json').exists()
+    assert (outdir / 'trades.csv').exists()
+    assert (outdir / f'trades.{file_format}').exists()
+    assert (outdir / 'equity_curve.csv').exists()
+    assert (outdir / f'equity_curve.{file_format}').exists()
+    assert (outdir / 'report.html').exists()
 
-        # Write report
-        write_backtest_report(result, outdir)
+    # Verify metrics content
+    with open(outdir / 'metrics.json') as f:
+        metrics = json.load(f)
+        assert 'cumulative_return' in metrics
+        assert 'generated_at' in metrics
+
+    # Read the written tables back and compare with the input frames
+    for name, expected in (('trades', trades), ('equity_curve', equity_curve)):
+        pd.testing.assert_frame_equal(_READERS[file_format](outdir / f'{name}.{file_format}'), expected)
+        pd.testing.assert_frame_equal(pd.read_csv(outdir / f'{name}.csv', parse_dates=['ts']), expected)
+
+
+def test_create_html_report(tmp_path):
+    """Test the real HTML report render."""
+    dates = pd.date_range('2024-01-01', periods=4, freq='1h')
+    result = {
+        'equity_curve': pd.DataFrame({'ts': dates, 'equity': [1000, 1010, 1005, 1012]}),
+        'trades': pd.DataFrame({
+            'ts': dates[:2],
+            'position': [0.5, 0.0],
+            'trade': [0.5, -0.5],
+            'equity': [1000, 1010]
+        })
+    }
+    create_html_report(result, tmp_path)
+    assert "Backtest Results" in (tmp_path / "report.html").read_text()
 
-        # Verify files
-        assert (outdir / 'metrics.json').exists()
-        assert (outdir / 'trades.csv').exists()
-        assert (outdir / 'trades.parquet').exists()
-        assert (outdir / 'equity_curve.csv').exists()
-        assert (outdir / 'equity_curve.parquet').exists()
-        assert (outdir / 'report.html').exists()
 
-        # Verify metrics content
-        with open(outdir / 'metrics.json') as f:
-            metrics = json.load(f)
-            assert 'cumulative_return' in metrics
-            assert 'generated_at' in metrics
+def test_write_backtest_report_invalid_format(tmp_path):
+    """Test an unknown table format is rejected."""
+    backtest_result = {"trades": pd.DataFrame({"price": [50000]})}
+    with pytest.raises(ValueError, match="Unsupported file_format"):
+        write_backtest_report(backtest_result, tmp_path, file_format="hdf5")
 
-        # Verify data files
-        loaded_trades = pd.read_parquet(outdir / 'trades.parquet')
-        pd.testing.assert_frame_equal(loaded_trades, trades)
 
-        loaded_eq = pd.read_parquet(outdir / 'equity_curve.parquet')
-        pd.testing.assert_frame_equal(loaded_eq, equity_curve)
+def test_write_backtest_report_invalid_format_writes_nothing(tmp_path):
+    """Test the format is rejected up front, even when there are no tables to write."""
+    outdir = tmp_path / "report"
+    with pytest.raises(ValueError, match="Unsupported file_format"):
+        write_backtest_report({"metrics": {"sharpe": 1.5}, "trades": pd.DataFrame()}, outdir, file_format="hdf5")
+    assert not outdir.exists()
 
 
-def test_backtest_report_empty():
+def test_backtest_report_empty(tmp_path):
     """Test report generation with empty results"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        outdir = Path(tmpdir)
+    outdir = tmp_path
 
-        result = {
-            'metrics': {'cumulative_return': 0.0},
-            'equity_curve': pd.DataFrame(),
-            'trades': pd.DataFrame()
-        }
+    result = {
+        'metrics': {'cumulative_return': 0.0},
+        'equity_curve': pd.DataFrame(),
+        'trades': pd.DataFrame()
+    }
 
-        write_backtest_report(result, outdir)
-        assert (outdir / 'metrics.json').exists()
+    write_backtest_report(result, outdir)
+    assert (outdir / 'metrics.json').exists()
 
 def test_html_report_generation_failure(tmp_path):
     """Test that a warning is logged if HTML report generation fails."""
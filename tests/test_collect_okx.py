@@ -1,18 +1,18 @@
 import os
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 import pandas as pd
 import numpy as np
 from datetime import datetime, timezone
 from pathlib import Path
 import json
 import ccxt
-import asyncio
-import tempfile
 import yaml
 import sys
 from qlib.scripts.data_collector.crypto.collector import CryptoCollector
 
+OHLCV = frozenset(("open", "high", "low", "close", "volume"))
+
 class MockExchange:
     def __init__(self, mock_data):
         self.mock_data = mock_data
@@ -42,80 +42,76 @@ pytest tests/test_collect_okx.py -v \
 
 '''
 
-from qlib.examples.collect_okx_ohlcv import OKXCollector
+from qlib.examples.collect_okx_ohlcv import OKXCollector, main
+
+@pytest.fixture(autouse=True, scope="module")
+def patched_okx():
+    """Patch ccxt.okx once for the whole module so no test builds a real exchange"""
+    patcher = patch("ccxt.okx")
+    yield patcher.start()
+    patcher.stop()
+
+@pytest.fixture(autouse=True)
+def reset_patched_okx(patched_okx):
+    """Start every test from a clean ccxt.okx mock (no return value or calls from earlier tests)"""
+    patched_okx.reset_mock(return_value=True, side_effect=True)
 
-def test_okx_collector_init():
+@pytest.fixture(scope="module")
+def crypto_collector(patched_okx):
+    """One CryptoCollector per module; tests swap ``exchange`` via monkeypatch"""
+    return CryptoCollector(save_dir="/tmp/qlib_data", interval="15min", qlib_home="/home/watson/work/qlib")
+
+def test_okx_collector_init(crypto_collector):
     """Test collector initialization with config"""
-    collector = CryptoCollector(save_dir="/tmp/qlib_data", interval="15min", qlib_home="/home/watson/work/qlib")
+    collector = crypto_collector
     assert collector.interval == "15min"
     assert collector._timezone == "UTC"
 
-@pytest.fixture
-def mock_ohlcv_data():
-    """Generate mock OHLCV data"""
-    dates = pd.date_range("2024-01-01", "2024-01-02", freq="15min", tz="UTC")
-    data = pd.DataFrame({
-        "timestamp": dates,
-        "open": np.random.random(len(dates)) * 100 + 40000,
-        "high": np.random.random(len(dates)) * 100 + 40100,
-        "low": np.random.random(len(dates)) * 100 + 39900,
-        "close": np.random.random(len(dates)) * 100 + 40000,
-        "volume": np.random.random(len(dates)) * 1000
-    })
-    return data
-
 @pytest.mark.asyncio
-async def test_fetch_data(mock_ohlcv_data):
+async def test_fetch_data(mock_ohlcv_data, crypto_collector, monkeypatch):
     """Test data fetching with mock response"""
-    with patch("ccxt.okx") as mock_okx:
-        mock_exchange = Mock()
-        mock_exchange.fetch_ohlcv.return_value = asyncio.Future()
-        mock_exchange.fetch_ohlcv.return_value.set_result(mock_ohlcv_data.values.tolist())
-        mock_okx.return_value = mock_exchange
+    mock_exchange = Mock()
+    mock_exchange.fetch_ohlcv = AsyncMock(return_value=np.column_stack(list(mock_ohlcv_data.values())).tolist())
         
-        collector = CryptoCollector(save_dir="/tmp/qlib_data", interval="15min", qlib_home="/home/watson/work/qlib")
-        collector.exchange = mock_exchange
-        data = await collector.get_data(
-            symbol="BTC/USDT",
-            interval="15min",
-            start_datetime=pd.Timestamp("2024-01-01", tz="UTC"),
-            end_datetime=pd.Timestamp("2024-01-02", tz="UTC")
-        )
+    collector = crypto_collector
+    monkeypatch.setattr(collector, "exchange", mock_exchange)
+    data = await collector.get_data(
+        symbol="BTC/USDT",
+        interval="15min",
+        start_datetime=pd.Timestamp("2024-01-01", tz="UTC"),
+        end_datetime=pd.Timestamp("2024-01-02", tz="UTC")
+    )
         
-        assert isinstance(data, pd.DataFrame)
-        assert len(data) == len(mock_ohlcv_data)
-        assert all(col in data.columns for col in ["open", "high", "low", "close", "volume"])
-        assert data.index.freq == "15min"
+    assert isinstance(data, pd.DataFrame)
+    assert len(data) == len(mock_ohlcv_data["timestamp"])
+    assert OHLCV.issubset(data.columns)
+    assert (np.diff(data.index.asi8) == pd.Timedelta(minutes=15).value).all()  # evenly spaced 15min bars
 
 @pytest.mark.asyncio
-async def test_fetch_data_rate_limit_retry(mock_ohlcv_data):
+async def test_fetch_data_rate_limit_retry(mock_ohlcv_data, crypto_collector, monkeypatch):
     """Test rate limit handling and retry logic"""
-    with patch("ccxt.okx") as mock_okx:
-        mock_exchange = Mock()
-        # First call raises rate limit, second succeeds
-        future = asyncio.Future()
-        future.set_result(mock_ohlcv_data.values.tolist())
-        mock_exchange.fetch_ohlcv.side_effect = [
-            ccxt.RateLimitExceeded("Rate limit exceeded"),
-            future
-        ]
-        mock_okx.return_value = mock_exchange
-
-        collector = CryptoCollector(save_dir="/tmp/qlib_data", interval="15min", qlib_home="/home/watson/work/qlib")
-        collector.exchange = mock_exchange
-        data = await collector.get_data(
-            symbol="BTC/USDT",
-            interval="15min",
-            start_datetime=pd.Timestamp("2024-01-01", tz="UTC"),
-            end_datetime=pd.Timestamp("2024-01-02", tz="UTC")
-        )
+    mock_exchange = Mock()
+    # First call raises rate limit, second succeeds
+    mock_exchange.fetch_ohlcv = AsyncMock(side_effect=[
+        ccxt.RateLimitExceeded("Rate limit exceeded"),
+        np.column_stack(list(mock_ohlcv_data.values())).tolist()
+    ])
+
+    collector = crypto_collector
+    monkeypatch.setattr(collector, "exchange", mock_exchange)
+    data = await collector.get_data(
+        symbol="BTC/USDT",
+        interval="15min",
+        start_datetime=pd.Timestamp("2024-01-01", tz="UTC"),
+        end_datetime=pd.Timestamp("2024-01-02", tz="UTC")
+    )
 
-        assert isinstance(data, pd.DataFrame)
-        assert mock_exchange.fetch_ohlcv.call_count == 2
+    assert isinstance(data, pd.DataFrame)
+    assert mock_exchange.fetch_ohlcv.call_count == 2
 
-def test_data_validation():
+def test_data_validation(crypto_collector):
     """Test data validation rules"""
-    collector = CryptoCollector(save_dir="/tmp/qlib_data", interval="15min", qlib_home="/home/watson/work/qlib")
+    collector = crypto_collector
     
     # Test missing data threshold
     dates = pd.date_range("2024-01-01", "2024-01-02", freq="15min", tz="UTC")
@@ -126,13 +122,12 @@ def test_data_validation():
     with pytest.raises(ValueError, match="Missing data exceeds threshold"):
         collector.validate_data(data)
 
-def test_data_validation_edge_cases(sample_ohlcv_data, config_for_test):
+def test_data_validation_edge_cases(sample_ohlcv_data, config_for_test, crypto_collector):
     """Test various data validation scenarios"""
-    collector = CryptoCollector(save_dir="/tmp/qlib_data", interval="15min", qlib_home="/home/watson/work/qlib")
+    collector = crypto_collector
 
     # Test price spike detection
     df = sample_ohlcv_data.copy()
-    df.set_index("timestamp", inplace=True)
     result, report = collector.validate_data(df)
     assert report["outliers_detected"] >= 5  # Price spike window
 
@@ -142,21 +137,39 @@ def test_data_validation_edge_cases(sample_ohlcv_data, config_for_test):
 
     # Test gap detection
     df = sample_ohlcv_data.copy()
-    df.set_index("timestamp", inplace=True)
     df = df.drop(df.index[40:45])  # Create gap
     result, report = collector.validate_data(df)
     assert "gaps_detected" in report
     assert report["gaps_detected"] == 5
 
+def test_handle_gaps_large(crypto_collector):
+    """Gap counting stays vectorized on a million-bar frame"""
+    n = 1_000_000
+    index = pd.to_datetime(np.arange(0, 900 * n, 900), unit="s", utc=True)
+    df = pd.DataFrame({"close": np.ones(n)}, index=index).drop(index[1000:1003])
+
+    _, gaps = crypto_collector._handle_gaps(df)
+    assert gaps == 3
+
+def test_handle_gaps_index_type(crypto_collector):
+    """Short frames report no gaps for any index; longer ones need a DatetimeIndex"""
+    for rows in (0, 1):
+        _, gaps = crypto_collector._handle_gaps(pd.DataFrame({"close": np.ones(rows)}))
+        assert gaps == 0
+
+    with pytest.raises(TypeError, match="DatetimeIndex"):
+        crypto_collector._handle_gaps(pd.DataFrame({"close": np.ones(3)}))
+
 def test_data_persistence(test_data_dir, mock_ohlcv_data):
     """Test data saving and loading with manifest"""
 
-    import os
     collector = CryptoCollector(save_dir=test_data_dir, interval="15min")
+    mock_ohlcv_data = pd.DataFrame(mock_ohlcv_data)
+    mock_ohlcv_data["timestamp"] = pd.to_datetime(mock_ohlcv_data["timestamp"], unit="ms", utc=True)
     
     # Save data
     symbol = "BTC-USDT"
-    collector.save_data(mock_ohlcv_data, symbol=symbol)
+    collector.save_data(mock_ohlcv_data, symbol=symbol, compression=None)
     
     # Verify file structure
     data_path = test_data_dir / "okx" / symbol / "15min"
@@ -173,14 +186,14 @@ def test_data_persistence(test_data_dir, mock_ohlcv_data):
     saved_data = pd.read_parquet(data_path / f"{mock_ohlcv_data.index[0].strftime('%Y-%m-%d')}.parquet")
     # Check that saved data is subset of original (due to date grouping)
     assert len(saved_data) <= len(mock_ohlcv_data)
-    assert all(col in saved_data.columns for col in mock_ohlcv_data.columns)
+    assert set(mock_ohlcv_data.columns).issubset(saved_data.columns)
 
 @pytest.mark.integration
+@pytest.mark.skipif(os.getenv("QLIB_FAST_TESTS") == "1", reason="QLIB_FAST_TESTS=1 skips the full collection workflow")
 @pytest.mark.asyncio
 async def test_full_collection_workflow(test_data_dir, config_for_test):
     """Test complete data collection workflow"""
 
-    import os
     collector = CryptoCollector(
         save_dir=test_data_dir,
         interval="15min"
@@ -193,39 +206,36 @@ async def test_full_collection_workflow(test_data_dir, config_for_test):
 
 
 @pytest.mark.asyncio
-async def test_okx_collector_workflow():
+async def test_okx_collector_workflow(tmp_path):
     """Test OKXCollector workflow"""
     collector = OKXCollector()
     assert collector is not None
     # Add more test logic here if needed
 
     # Mock the exchange to avoid real API calls
-    with patch("ccxt.okx") as mock_okx:
-        mock_exchange = Mock()
-        # Create futures: first call returns data, subsequent calls return empty list
-        future_with_data = asyncio.Future()
-        future_with_data.set_result([
+    mock_exchange = Mock()
+    # First call returns data, the next one an empty list
+    mock_exchange.fetch_ohlcv = AsyncMock(side_effect=[
+        [
             [1704067200000, 40000, 40100, 39900, 40050, 1000],
             [1704068100000, 40050, 40200, 40000, 40100, 1100]
-        ])
-        future_empty = asyncio.Future()
-        future_empty.set_result([])
-        mock_exchange.fetch_ohlcv.side_effect = [future_with_data, future_empty]
-        mock_okx.return_value = mock_exchange
-        collector.exchange = mock_exchange
-
-        # Define test variables
-        symbol = "BTC/USDT"
-        start_date = datetime(2024, 1, 1)
-        end_date = datetime(2024, 1, 2)
-        output_path = Path("/tmp/test_output.parquet")
+        ],
+        []
+    ])
+    collector.exchange = mock_exchange
 
-        await collector.download_data(
-            symbol=symbol,
-            start_datetime=start_date,
-            end_datetime=end_date,
-            output_path=output_path
-        )
+    # Define test variables
+    symbol = "BTC/USDT"
+    start_date = datetime(2024, 1, 1)
+    end_date = datetime(2024, 1, 2)
+    output_path = tmp_path / "test_output.parquet"
+
+    await collector.download_data(
+        symbol=symbol,
+        start_datetime=start_date,
+        end_datetime=end_date,
+        output_path=output_path
+    )
 
     # Verify output file exists
     assert output_path.exists()
@@ -233,9 +243,9 @@ async def test_okx_collector_workflow():
     # Load and verify data
     df = pd.read_parquet(output_path)
     assert len(df) == 2  # Should have the two rows from the mock data
-    assert all(col in df.columns for col in ['open', 'high', 'low', 'close', 'volume'])
+    assert OHLCV.issubset(df.columns)
 
-def test_collect_historical():
+def test_collect_historical(tmp_path):
     # Mock data
     mock_data = [
         [1640995200000, 46813.21, 46937.91, 46761.32, 46850.23, 1234.56],  # 2022-01-01
@@ -243,67 +253,63 @@ def test_collect_historical():
         [1641002400000, 47050.78, 47200.00, 46900.00, 47150.34, 765.43]
     ]
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        output_path = Path(tmpdir) / "btc_usdt_1h.parquet"
+    output_path = tmp_path / "btc_usdt_1h.parquet"
 
-        # Create collector with mock exchange
-        collector = OKXCollector()
-        collector.exchange = MockExchange(mock_data)
-
-        # Collect data
-        df = collector.collect_historical(
-            symbol="BTC/USDT",
-            timeframe="1h",
-            start_time=datetime(2022, 1, 1),
-            end_time=datetime(2022, 1, 1, 1),  # Shorten end_time to ensure loop exits
-            output_path=output_path
-        )
+    # Create collector with mock exchange
+    collector = OKXCollector()
+    collector.exchange = MockExchange(mock_data)
+
+    # Collect data
+    df = collector.collect_historical(
+        symbol="BTC/USDT",
+        timeframe="1h",
+        start_time=datetime(2022, 1, 1),
+        end_time=datetime(2022, 1, 1, 1),  # Shorten end_time to ensure loop exits
+        output_path=output_path
+    )
 
-        # Verify DataFrame
-        assert isinstance(df, pd.DataFrame)
-        assert len(df) == len(mock_data)
-        assert all(col in df.columns for col in ['open', 'high', 'low', 'close', 'volume'])
+    # Verify DataFrame
+    assert isinstance(df, pd.DataFrame)
+    assert len(df) == len(mock_data)
+    assert OHLCV.issubset(df.columns)
 
-        # Verify parquet file
-        assert output_path.exists()
-        loaded_df = pd.read_parquet(output_path)
-        pd.testing.assert_frame_equal(df, loaded_df)
+    # Verify parquet file
+    assert output_path.exists()
+    loaded_df = pd.read_parquet(output_path)
+    pd.testing.assert_frame_equal(df, loaded_df)
 
-        # Verify manifest
-        manifest_path = output_path.parent / 'manifest.yaml'
-        assert manifest_path.exists()
+    # Verify manifest
+    manifest_path = output_path.parent / 'manifest.yaml'
+    assert manifest_path.exists()
 
-        with open(manifest_path) as f:
-            manifest = yaml.safe_load(f)
+    with open(manifest_path) as f:
+        manifest = yaml.safe_load(f)
 
-        assert output_path.name in manifest
-        entry = manifest[output_path.name]
-        assert all(k in entry for k in ['symbol', 'timeframe', 'start_ts', 'end_ts', 'row_count', 'file_hash'])
+    assert output_path.name in manifest
+    entry = manifest[output_path.name]
+    assert all(k in entry for k in ['symbol', 'timeframe', 'start_ts', 'end_ts', 'row_count', 'file_hash'])
 
 @pytest.mark.asyncio
-async def test_download_data_error_handling():
+async def test_download_data_error_handling(tmp_path):
     """Test error handling in download_data method"""
     collector = OKXCollector()
 
     # Mock exchange to raise an exception
-    with patch("ccxt.okx") as mock_okx:
-        mock_exchange = Mock()
-        mock_exchange.fetch_ohlcv.side_effect = Exception("API Error")
-        mock_okx.return_value = mock_exchange
-        collector.exchange = mock_exchange
-
-        with pytest.raises(Exception, match="API Error"):
-            await collector.download_data(
-                symbol="BTC/USDT",
-                start_datetime=datetime(2024, 1, 1),
-                end_datetime=datetime(2024, 1, 2),
-                output_path=Path("/tmp/test_error.parquet")
-            )
+    mock_exchange = Mock()
+    mock_exchange.fetch_ohlcv.side_effect = Exception("API Error")
+    collector.exchange = mock_exchange
+
+    with pytest.raises(Exception, match="API Error"):
+        await collector.download_data(
+            symbol="BTC/USDT",
+            start_datetime=datetime(2024, 1, 1),
+            end_datetime=datetime(2024, 1, 2),
+            output_path=tmp_path / "test_error.parquet"
+        )
 
+@pytest.mark.xdist_group("sys_modules")
 def test_main_function():
     """Test the main function with mocked arguments"""
-    from qlib.examples.collect_okx_ohlcv import main
-    import sys
 
     # Mock sys.argv
     original_argv = sys.argv
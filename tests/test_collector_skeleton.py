@@ -3,132 +3,135 @@ from unittest.mock import Mock, patch, AsyncMock
 import pandas as pd
 from datetime import datetime
 import ccxt.async_support as ccxt
-import sys
-from pathlib import Path
 
-# Ensure examples directory is in Python path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from examples.collect_okx_ohlcv import CryptoCollector, main
 
-from examples.collect_okx_ohlcv import CryptoCollector
+# Raw OKX candles shared by the fetch/process tests: [ts_ms, open, high, low, close, volume]
+_KLINE_0 = [1641024000000, 46000, 46100, 45900, 46050, 100]
+_KLINE_1 = [1641025800000, 46050, 46200, 46000, 46100, 200]
+_T_START, _T_END = datetime(2022, 1, 1), datetime(2022, 1, 2)
 
-def test_collector_initialization():
+@pytest.fixture(autouse=True, scope="module")
+def patched_async_okx():
+    """Patch ccxt.async_support.okx once for the whole module so no test builds a real exchange"""
+    patcher = patch("ccxt.async_support.okx")
+    yield patcher.start()
+    patcher.stop()
+
+@pytest.fixture(autouse=True)
+def reset_patched_async_okx(patched_async_okx):
+    """Start every test from a clean okx mock (no return value or calls from earlier tests)"""
+    patched_async_okx.reset_mock(return_value=True, side_effect=True)
+
+@pytest.fixture
+def mock_exchange(patched_async_okx):
+    """Fresh exchange mock returned by the patched okx constructor"""
+    exchange = Mock()
+    patched_async_okx.return_value = exchange
+    return exchange
+
+@pytest.fixture(scope="module")
+def okx_collector():
+    """Shared collector for tests that do not patch the exchange"""
+    return CryptoCollector(exchange_id="okx", interval="15min")
+
+def test_collector_initialization(okx_collector):
     """Test basic collector setup"""
-    collector = CryptoCollector(
-        exchange_id="okx",
-        interval="15min"
-    )
+    collector = okx_collector
     assert collector.exchange_id == "okx"
     assert collector.interval == "15min"
     assert collector.exchange is not None
 
 @pytest.mark.asyncio
-async def test_rate_limit_handling():
+async def test_rate_limit_handling(mock_exchange):
     """Test rate limit handling behavior"""
-    with patch('ccxt.async_support.okx') as mock_exchange_class:
-        mock_exchange = Mock()
-        mock_exchange.fetch_ohlcv = AsyncMock(side_effect=[
-            ccxt.RateLimitExceeded("Rate limit"),  # First call fails
-            [[1641024000000, 46000, 46100, 45900, 46050, 100]]  # Second succeeds
-        ])
-        mock_exchange_class.return_value = mock_exchange
-        
-        collector = CryptoCollector(exchange_id="okx", interval="15m")
-        
-        # Should retry and succeed
-        data = await collector.fetch_data(
-            symbol="BTC/USDT",
-            start=datetime(2022, 1, 1),
-            end=datetime(2022, 1, 2)
-        )
-        assert len(mock_exchange.fetch_ohlcv.call_args_list) == 2
-        
-        assert isinstance(data, pd.DataFrame)
-        assert 'open' in data.columns
+    mock_exchange.fetch_ohlcv = AsyncMock(side_effect=[
+        ccxt.RateLimitExceeded("Rate limit"),  # First call fails
+        [_KLINE_0]  # Second succeeds
+    ])
+    
+    collector = CryptoCollector(exchange_id="okx", interval="15m")
+    
+    # Should retry and succeed
+    data = await collector.fetch_data(
+        symbol="BTC/USDT",
+        start=_T_START,
+        end=_T_END
+    )
+    assert len(mock_exchange.fetch_ohlcv.call_args_list) == 2
+    
+    assert isinstance(data, pd.DataFrame)
+    assert 'open' in data.columns
 
 @pytest.mark.asyncio
-async def test_collector_basic():
+async def test_collector_basic(okx_collector):
     """Test basic collector functionality"""
-    collector = CryptoCollector(exchange_id="okx", interval="15min")
+    collector = okx_collector
     assert collector.exchange_id == "okx"
     assert collector.interval == "15min"
 
 @pytest.mark.asyncio
-async def test_fetch_data_success():
+async def test_fetch_data_success(mock_exchange):
     """Test successful data fetch"""
-    mock_data = [
-        [1641024000000, 46000, 46100, 45900, 46050, 100],
-        [1641025800000, 46050, 46200, 46000, 46100, 200]
-    ]
+    mock_data = [_KLINE_0, _KLINE_1]
     
-    with patch('ccxt.async_support.okx') as mock_exchange_class:
-        mock_exchange = Mock()
-        mock_exchange.fetch_ohlcv = AsyncMock(return_value=mock_data)
-        mock_exchange_class.return_value = mock_exchange
-        
-        collector = CryptoCollector(exchange_id="okx", interval="15min")
-        data = await collector.fetch_data(
-            symbol="BTC/USDT",
-            start=datetime(2022, 1, 1),
-            end=datetime(2022, 1, 2)
-        )
-        
-        # Verify mock was called with correct parameters
-        mock_exchange.fetch_ohlcv.assert_called_once()
-        assert isinstance(data, pd.DataFrame)
-        assert len(data) == 2
-        assert list(data.columns) == ['open', 'high', 'low', 'close', 'volume']
+    mock_exchange.fetch_ohlcv = AsyncMock(return_value=mock_data)
+    
+    collector = CryptoCollector(exchange_id="okx", interval="15min")
+    data = await collector.fetch_data(
+        symbol="BTC/USDT",
+        start=_T_START,
+        end=_T_END
+    )
+    
+    # Verify mock was called with correct parameters
+    mock_exchange.fetch_ohlcv.assert_called_once()
+    assert isinstance(data, pd.DataFrame)
+    assert len(data) == 2
+    assert list(data.columns) == ['open', 'high', 'low', 'close', 'volume']
 
 @pytest.mark.asyncio
-async def test_process_raw_data():
+async def test_process_raw_data(okx_collector):
     """Test data processing"""
-    collector = CryptoCollector(exchange_id="okx", interval="15min")
-    raw_data = [
-        [1641024000000, 46000, 46100, 45900, 46050, 100]
-    ]
+    collector = okx_collector
+    raw_data = [_KLINE_0]
 
     df = collector._process_raw_data(raw_data)
     assert df.index.name == 'timestamp'
     assert df.index[0].timestamp() == 1641024000
 
 @pytest.mark.asyncio
-async def test_fetch_data_max_retries_exceeded():
+async def test_fetch_data_max_retries_exceeded(mock_exchange):
     """Test when max retries are exceeded for rate limit"""
-    with patch('ccxt.async_support.okx') as mock_exchange_class:
-        mock_exchange = Mock()
-        mock_exchange.fetch_ohlcv = AsyncMock(side_effect=ccxt.RateLimitExceeded("Rate limit"))
-        mock_exchange_class.return_value = mock_exchange
-
-        collector = CryptoCollector(exchange_id="okx", interval="15m")
-
-        with pytest.raises(ccxt.RateLimitExceeded):
-            await collector.fetch_data(
-                symbol="BTC/USDT",
-                start=datetime(2022, 1, 1),
-                end=datetime(2022, 1, 2)
-            )
-        # Should have called 3 times (max_retries)
-        assert len(mock_exchange.fetch_ohlcv.call_args_list) == 3
+    mock_exchange.fetch_ohlcv = AsyncMock(side_effect=ccxt.RateLimitExceeded("Rate limit"))
+
+    collector = CryptoCollector(exchange_id="okx", interval="15m")
+
+    with pytest.raises(ccxt.RateLimitExceeded):
+        await collector.fetch_data(
+            symbol="BTC/USDT",
+            start=_T_START,
+            end=_T_END
+        )
+    # Should have called 3 times (max_retries)
+    assert len(mock_exchange.fetch_ohlcv.call_args_list) == 3
 
 @pytest.mark.asyncio
-async def test_fetch_data_other_exception():
+async def test_fetch_data_other_exception(mock_exchange):
     """Test handling of non-rate-limit exceptions"""
-    with patch('ccxt.async_support.okx') as mock_exchange_class:
-        mock_exchange = Mock()
-        mock_exchange.fetch_ohlcv = AsyncMock(side_effect=Exception("Other error"))
-        mock_exchange_class.return_value = mock_exchange
-
-        collector = CryptoCollector(exchange_id="okx", interval="15m")
-
-        with pytest.raises(Exception):
-            await collector.fetch_data(
-                symbol="BTC/USDT",
-                start=datetime(2022, 1, 1),
-                end=datetime(2022, 1, 2)
-            )
-        # Should have called once, since not rate limit
-        assert len(mock_exchange.fetch_ohlcv.call_args_list) == 1
+    mock_exchange.fetch_ohlcv = AsyncMock(side_effect=Exception("Other error"))
+
+    collector = CryptoCollector(exchange_id="okx", interval="15m")
+
+    with pytest.raises(Exception):
+        await collector.fetch_data(
+            symbol="BTC/USDT",
+            start=_T_START,
+            end=_T_END
+        )
+    # Should have called once, since not rate limit
+    assert len(mock_exchange.fetch_ohlcv.call_args_list) == 1
 
 def test_main():
     """Test main function"""
-    from examples.collect_okx_ohlcv import main
     main()  # Should do nothing
@@ -29,8 +29,8 @@ def test_run_backtest(tmp_path):
     # Save test data to files
     signals_path = tmp_path / "signals.parquet"
     ohlcv_path = tmp_path / "ohlcv.parquet"
-    signals.to_parquet(signals_path)
-    ohlcv.to_parquet(ohlcv_path)
+    signals.to_parquet(signals_path, compression=None)
+    ohlcv.to_parquet(ohlcv_path, compression=None)
 
     # Call the function
     result = run_backtest(str(signals_path), str(ohlcv_path), tmp_path)
@@ -1,29 +1,18 @@
 import pytest
 import pandas as pd
 import numpy as np
-import sys
+import pyarrow as pa
+import pyarrow.parquet as pq
 import time
-from pathlib import Path
-
-# Add current directory to path for examples import
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from examples.preprocess_features import compute_technical_features, align_and_fill, prepare_features
 from features.crypto_workflow.alpha360 import Alpha360Calculator
 
 @pytest.fixture
-def sample_ohlcv():
+def sample_ohlcv(random_walk_ohlcv):
     """Create realistic OHLCV data with gaps and outliers."""
     dates = pd.date_range('2023-01-01', '2023-01-31', freq='1h')
-    np.random.seed(42)
-    
-    df = pd.DataFrame({
-        'open': 100 + np.random.randn(len(dates)).cumsum(),
-        'high': 101 + np.random.randn(len(dates)).cumsum(),
-        'low': 99 + np.random.randn(len(dates)).cumsum(),
-        'close': 100 + np.random.randn(len(dates)).cumsum(),
-        'volume': np.random.randint(1000, 10000, len(dates))
-    }, index=dates)
+    df = random_walk_ohlcv(dates, np.random.default_rng(42))
     
     # Add some gaps (NaN values)
     df.iloc[10:15] = np.nan
@@ -44,7 +33,7 @@ def test_align_and_fill(sample_ohlcv):
     
     # Check index is datetime and sorted
     assert isinstance(filled_df.index, pd.DatetimeIndex)
-    assert filled_df.index.is_monotonic_increasing
+    assert (np.diff(filled_df.index.asi8) >= 0).all()
     
     # Check forward fill worked correctly
     gap_start = sample_ohlcv.index[10]
@@ -92,7 +81,7 @@ def test_prepare_features_end_to_end(tmp_path, sample_ohlcv):
     """Test complete feature preparation pipeline."""
     # Save sample OHLCV
     ohlcv_path = tmp_path / "ohlcv.parquet"
-    sample_ohlcv.to_parquet(str(ohlcv_path))
+    sample_ohlcv.to_parquet(str(ohlcv_path), compression=None)
     
     # Run feature preparation
     target_path = tmp_path / "features"
@@ -162,27 +151,20 @@ def test_error_handling_invalid_input(tmp_path):
         prepare_features(123, "BTC-USDT", "1h", str(tmp_path))
     
     # Missing columns
-    bad_df = pd.DataFrame({'close': [1,2,3]})
     bad_path = tmp_path / "bad.parquet"
-    bad_df.to_parquet(str(bad_path))
+    pq.write_table(pa.table({'close': [1, 2, 3]}), bad_path, compression=None)
     
     with pytest.raises(KeyError):
         prepare_features(str(bad_path), "BTC-USDT", "1h", str(tmp_path))
 
-def test_preprocessing_large_dataset(tmp_path):
+def test_preprocessing_large_dataset(tmp_path, random_walk_ohlcv):
     """Test preprocessing performance with large dataset."""
     # Create large dataset
     dates = pd.date_range('2020-01-01', '2023-12-31', freq='5min')
-    df = pd.DataFrame({
-        'open': np.random.randn(len(dates)).cumsum() + 100,
-        'high': np.random.randn(len(dates)).cumsum() + 101,
-        'low': np.random.randn(len(dates)).cumsum() + 99,
-        'close': np.random.randn(len(dates)).cumsum() + 100,
-        'volume': np.random.randint(1000, 10000, len(dates))
-    }, index=dates)
+    df = random_walk_ohlcv(dates, np.random.default_rng())
     
     input_path = tmp_path / "large_ohlcv.parquet"
-    df.to_parquet(str(input_path))
+    df.to_parquet(str(input_path), compression=None)
     
     start_time = time.time()
     prepare_features(str(input_path), "BTC-USDT", "5min", str(tmp_path))
@@ -199,7 +181,7 @@ def test_memory_usage_preprocessing(tmp_path, sample_ohlcv):
     initial_memory = process.memory_info().rss
     
     input_path = tmp_path / "test_ohlcv.parquet"
-    sample_ohlcv.to_parquet(str(input_path))
+    sample_ohlcv.to_parquet(str(input_path), compression=None)
     
     prepare_features(str(input_path), "BTC-USDT", "1h", str(tmp_path))
     
@@ -1,10 +1,6 @@
 import pytest
 from pathlib import Path
 import os
-import sys
-
-# Add project root to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.setup_project_structure import setup_project_directories
 
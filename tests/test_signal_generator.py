@@ -30,12 +30,11 @@ def test_signal_thresholds():
     """Test signal thresholds according to config"""
     generator = SignalGenerator()
     
-    # Test specific scores
-    test_cases = pd.Series({
-        pd.Timestamp("2024-01-01"): 0.8,  # Should be BUY
-        pd.Timestamp("2024-01-02"): 0.2,  # Should be SELL
-        pd.Timestamp("2024-01-03"): 0.5,  # Should be HOLD
-    })
+    # Test specific scores: should be BUY, SELL, HOLD
+    test_cases = pd.Series(
+        [0.8, 0.2, 0.5],
+        index=pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+    )
     
     signals = generator.generate(test_cases)
     assert signals.loc[signals["score"] == 0.8, "signal"].iloc[0] == "BUY"
@@ -46,12 +45,11 @@ def test_position_sizing():
     """Test position size calculation"""
     generator = SignalGenerator()
 
-    # Test extreme scores
-    test_cases = pd.Series({
-        pd.Timestamp("2024-01-01"): 1.0,  # Maximum buy
-        pd.Timestamp("2024-01-02"): 0.0,  # Maximum sell
-        pd.Timestamp("2024-01-03"): 0.5,  # Neutral
-    })
+    # Test extreme scores: maximum buy, maximum sell, neutral
+    test_cases = pd.Series(
+        [1.0, 0.0, 0.5],
+        index=pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+    )
 
     signals = generator.generate(test_cases)
     assert signals.loc[signals["score"] == 1.0, "position_size"].iloc[0] == 1.0
@@ -63,10 +61,10 @@ def test_save_signals(tmp_path):
     generator = SignalGenerator()
 
     # Generate test signals
-    test_cases = pd.Series({
-        pd.Timestamp("2024-01-01"): 0.8,
-        pd.Timestamp("2024-01-02"): 0.2,
-    })
+    test_cases = pd.Series(
+        [0.8, 0.2],
+        index=pd.to_datetime(["2024-01-01", "2024-01-02"]),
+    )
     signals = generator.generate(test_cases)
 
     # Save signals
@@ -1,14 +1,8 @@
 import pandas as pd
 import pytest
 import sys
-from pathlib import Path
 import features
 
-# Add project root to path
-root_path = str(Path(__file__).parent.parent)
-if root_path not in sys.path:
-    sys.path.append(root_path)
-
 from features.crypto_workflow.signal_rules import score_to_signal
 
 def test_score_to_signal_basic():
@@ -31,7 +31,7 @@ def test_train_lgb_end_to_end(tmp_path):
     model_dir.mkdir()
 
     df = make_sample_features(n=300)
-    df.to_parquet(str(feat_path))
+    df.to_parquet(str(feat_path), compression=None)
 
     result = train_from_features(str(feat_path), str(model_dir), model_name="test_model", early_stopping_rounds=10)
     model_path = Path(result["model_path"])
@@ -60,7 +60,7 @@ def test_missing_returns_column(tmp_path):
 
     df = make_sample_features(n=300)
     df = df.drop(columns=["returns"])
-    df.to_parquet(str(feat_path))
+    df.to_parquet(str(feat_path), compression=None)
 
     with pytest.raises(ValueError, match="Features must contain 'returns' column"):
         train_from_features(str(feat_path), str(model_dir))
@@ -73,7 +73,7 @@ def test_insufficient_data(tmp_path):
     model_dir.mkdir()
 
     df = make_sample_features(n=5)
-    df.to_parquet(str(feat_path))
+    df.to_parquet(str(feat_path), compression=None)
 
     with pytest.raises(ValueError, match="Not enough data to train"):
         train_from_features(str(feat_path), str(model_dir))
@@ -87,7 +87,7 @@ def test_logging_and_return_values(tmp_path, caplog):
     model_dir.mkdir()
 
     df = make_sample_features(n=300)
-    df.to_parquet(str(feat_path))
+    df.to_parquet(str(feat_path), compression=None)
 
     result = train_from_features(str(feat_path), str(model_dir), model_name="test_model", early_stopping_rounds=10)
 
@@ -110,7 +110,7 @@ def test_main_function(tmp_path, monkeypatch):
     model_dir.mkdir()
 
     df = make_sample_features(n=300)
-    df.to_parquet(str(feat_path))
+    df.to_parquet(str(feat_path), compression=None)
 
     # Mock sys.argv to simulate command line arguments
     import sys